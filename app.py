@@ -1,132 +1,240 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import re
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+from collections import namedtuple
+from functools import lru_cache
+import ahocorasick  # type: ignore[import-not-found]
+import orjson
+import os
+import sys
 import logging
 
-# Configure logging for debugging
-logging.basicConfig(level=logging.INFO)
+# Configure logging; set LOG_LEVEL=DEBUG to log each request and result.
+# Unrecognised levels fall back to WARNING instead of failing at import.
+# (getLevelName maps known level names to ints, also on Python 3.9.)
+_requested_level = os.environ.get("LOG_LEVEL", "WARNING").upper()
+if isinstance(logging.getLevelName(_requested_level), int):
+    _log_level = _requested_level
+else:
+    _log_level = "WARNING"
+logging.basicConfig(level=_log_level)
 logger = logging.getLogger(__name__)
+if _log_level != _requested_level:
+    logger.warning("Unknown LOG_LEVEL %r, using WARNING", _requested_level)
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider backed by orjson, which is much faster than the stdlib json
+    module that Flask uses by default. Covers jsonify in the error handlers
+    and the 500 path; the hot endpoints call orjson directly.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
-CORS(app, origins=["*"])  # Enable CORS for all origins
+app.json = ORJSONProvider(app)
+
+# Symptom descriptions are short; reject oversized request bodies up front
+app.config["MAX_CONTENT_LENGTH"] = 16 * 1024
+
+@app.after_request
+def add_cors_headers(response):
+    """
+    Enable CORS for all origins. With a wildcard origin the headers are
+    constant, so they are set directly rather than through Flask-CORS.
+    """
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    if request.method == "OPTIONS":
+        # Answer the preflight sent before JSON POSTs from the frontend
+        response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+    return response
+
+# A symptom's possible conditions, self-care advice, and urgency flag
+SymptomEntry = namedtuple("SymptomEntry", "conditions advice urgent")
 
 # Fake symptom database - maps symptoms to conditions, advice, and urgency
 # In a real application, this would be a proper database with medical data
 SYMPTOM_DATABASE = {
     # Headache-related conditions
-    "headache": {
-        "conditions": ["Tension Headache", "Migraine", "Sinus Headache"],
-        "advice": "Rest in a quiet, dark room. Stay hydrated. Consider over-the-counter pain relievers like ibuprofen or acetaminophen.",
-        "urgent": False
-    },
-    "migraine": {
-        "conditions": ["Migraine", "Cluster Headache"],
-        "advice": "Lie down in a dark, quiet room. Apply cold compress to forehead. Avoid bright lights and loud noises.",
-        "urgent": False
-    },
+    "headache": SymptomEntry(
+        conditions=("Tension Headache", "Migraine", "Sinus Headache"),
+        advice="Rest in a quiet, dark room. Stay hydrated. Consider over-the-counter pain relievers like ibuprofen or acetaminophen.",
+        urgent=False
+    ),
+    "migraine": SymptomEntry(
+        conditions=("Migraine", "Cluster Headache"),
+        advice="Lie down in a dark, quiet room. Apply cold compress to forehead. Avoid bright lights and loud noises.",
+        urgent=False
+    ),
     
     # Fever-related conditions
-    "fever": {
-        "conditions": ["Common Cold", "Flu", "COVID-19", "Bacterial Infection"],
-        "advice": "Rest, stay hydrated, and monitor temperature. Take acetaminophen or ibuprofen for fever. Seek medical attention if fever persists above 103°F (39.4°C).",
-        "urgent": False
-    },
-    "high fever": {
-        "conditions": ["Severe Infection", "COVID-19", "Bacterial Infection"],
-        "advice": "Seek immediate medical attention. High fever can be dangerous, especially in children and elderly.",
-        "urgent": True
-    },
+    "fever": SymptomEntry(
+        conditions=("Common Cold", "Flu", "COVID-19", "Bacterial Infection"),
+        advice="Rest, stay hydrated, and monitor temperature. Take acetaminophen or ibuprofen for fever. Seek medical attention if fever persists above 103°F (39.4°C).",
+        urgent=False
+    ),
+    "high fever": SymptomEntry(
+        conditions=("Severe Infection", "COVID-19", "Bacterial Infection"),
+        advice="Seek immediate medical attention. High fever can be dangerous, especially in children and elderly.",
+        urgent=True
+    ),
     
     # Chest pain - always urgent
-    "chest pain": {
-        "conditions": ["Heart Attack", "Angina", "Pneumonia", "Costochondritis"],
-        "advice": "This is a medical emergency. Call emergency services immediately. Do not drive yourself to the hospital.",
-        "urgent": True
-    },
-    "chest tightness": {
-        "conditions": ["Heart Attack", "Angina", "Anxiety", "Asthma"],
-        "advice": "Seek immediate medical attention. Chest tightness can indicate serious heart or lung problems.",
-        "urgent": True
-    },
+    "chest pain": SymptomEntry(
+        conditions=("Heart Attack", "Angina", "Pneumonia", "Costochondritis"),
+        advice="This is a medical emergency. Call emergency services immediately. Do not drive yourself to the hospital.",
+        urgent=True
+    ),
+    "chest tightness": SymptomEntry(
+        conditions=("Heart Attack", "Angina", "Anxiety", "Asthma"),
+        advice="Seek immediate medical attention. Chest tightness can indicate serious heart or lung problems.",
+        urgent=True
+    ),
     
     # Respiratory symptoms
-    "shortness of breath": {
-        "conditions": ["Asthma", "Pneumonia", "COVID-19", "Anxiety", "Heart Problem"],
-        "advice": "Seek medical attention immediately. Difficulty breathing is a serious symptom that requires prompt evaluation.",
-        "urgent": True
-    },
-    "cough": {
-        "conditions": ["Common Cold", "Flu", "COVID-19", "Bronchitis", "Pneumonia"],
-        "advice": "Stay hydrated, rest, and monitor symptoms. Seek medical attention if cough is severe or accompanied by fever.",
-        "urgent": False
-    },
+    "shortness of breath": SymptomEntry(
+        conditions=("Asthma", "Pneumonia", "COVID-19", "Anxiety", "Heart Problem"),
+        advice="Seek medical attention immediately. Difficulty breathing is a serious symptom that requires prompt evaluation.",
+        urgent=True
+    ),
+    "cough": SymptomEntry(
+        conditions=("Common Cold", "Flu", "COVID-19", "Bronchitis", "Pneumonia"),
+        advice="Stay hydrated, rest, and monitor symptoms. Seek medical attention if cough is severe or accompanied by fever.",
+        urgent=False
+    ),
     
     # Abdominal symptoms
-    "stomach pain": {
-        "conditions": ["Gastritis", "Food Poisoning", "Appendicitis", "Irritable Bowel Syndrome"],
-        "advice": "Rest, stay hydrated, and avoid solid foods initially. Seek medical attention if pain is severe or persistent.",
-        "urgent": False
-    },
-    "severe abdominal pain": {
-        "conditions": ["Appendicitis", "Gallbladder Disease", "Bowel Obstruction", "Kidney Stones"],
-        "advice": "Seek immediate medical attention. Severe abdominal pain can indicate a serious condition requiring surgery.",
-        "urgent": True
-    },
+    "stomach pain": SymptomEntry(
+        conditions=("Gastritis", "Food Poisoning", "Appendicitis", "Irritable Bowel Syndrome"),
+        advice="Rest, stay hydrated, and avoid solid foods initially. Seek medical attention if pain is severe or persistent.",
+        urgent=False
+    ),
+    "severe abdominal pain": SymptomEntry(
+        conditions=("Appendicitis", "Gallbladder Disease", "Bowel Obstruction", "Kidney Stones"),
+        advice="Seek immediate medical attention. Severe abdominal pain can indicate a serious condition requiring surgery.",
+        urgent=True
+    ),
     
     # Dizziness and neurological symptoms
-    "dizziness": {
-        "conditions": ["Vertigo", "Dehydration", "Low Blood Pressure", "Inner Ear Problem"],
-        "advice": "Sit or lie down to prevent falls. Stay hydrated. Seek medical attention if dizziness is severe or accompanied by other symptoms.",
-        "urgent": False
-    },
-    "nausea": {
-        "conditions": ["Food Poisoning", "Gastritis", "Migraine", "Pregnancy", "Viral Infection"],
-        "advice": "Stay hydrated with small sips of water. Rest and avoid solid foods. Seek medical attention if severe or persistent.",
-        "urgent": False
-    }
+    "dizziness": SymptomEntry(
+        conditions=("Vertigo", "Dehydration", "Low Blood Pressure", "Inner Ear Problem"),
+        advice="Sit or lie down to prevent falls. Stay hydrated. Seek medical attention if dizziness is severe or accompanied by other symptoms.",
+        urgent=False
+    ),
+    "nausea": SymptomEntry(
+        conditions=("Food Poisoning", "Gastritis", "Migraine", "Pregnancy", "Viral Infection"),
+        advice="Stay hydrated with small sips of water. Rest and avoid solid foods. Seek medical attention if severe or persistent.",
+        urgent=False
+    )
+}
+
+# Precompute per-symptom lookup tables once at startup so each request only
+# does set unions and dict lookups
+_COND_SET = {
+    symptom: frozenset(data.conditions)
+    for symptom, data in SYMPTOM_DATABASE.items()
+}
+_ADVICE = {
+    symptom: sys.intern(data.advice)
+    for symptom, data in SYMPTOM_DATABASE.items()
 }
 
-def analyze_symptoms(symptom_text):
+# Give each symptom its own bit so a set of matches packs into a single int
+_BIT = {symptom: 1 << i for i, symptom in enumerate(SYMPTOM_DATABASE)}
+_URGENT_MASK = sum(
+    _BIT[symptom] for symptom, data in SYMPTOM_DATABASE.items() if data.urgent
+)
+
+# Symptoms whose phrase contains another symptom's phrase subsume it, e.g.
+# "high fever" subsumes "fever". Mentioning "high fever" drops "fever" from
+# the result even when "fever" also appears on its own elsewhere in the text.
+_SUBSUMED = {
+    symptom: sum(
+        bit for other, bit in _BIT.items() if other != symptom and other in symptom
+    )
+    for symptom in SYMPTOM_DATABASE
+}
+
+# What a match contributes: its own bit and the bits it subsumes
+_MATCH_BITS = {
+    symptom: (_BIT[symptom], _SUBSUMED[symptom]) for symptom in SYMPTOM_DATABASE
+}
+
+# Build a single Aho-Corasick automaton over all symptom keys so each request
+# scans the input once, regardless of how many symptoms are in the database
+SYMPTOM_AUTOMATON = ahocorasick.Automaton()
+for _symptom in SYMPTOM_DATABASE:
+    SYMPTOM_AUTOMATON.add_word(_symptom, _MATCH_BITS[_symptom])
+SYMPTOM_AUTOMATON.make_automaton()
+
+def _match_symptoms(symptom_text: str) -> int:
+    """
+    Return a bitmask (see _BIT) of the symptoms found in lowercased text,
+    excluding symptoms subsumed by a longer match.
+    """
+    mask = 0
+    subsumed = 0
+    # iter_long prefers the longest match at each position
+    for _, (bit, covers) in SYMPTOM_AUTOMATON.iter_long(symptom_text):
+        mask |= bit
+        subsumed |= covers
+    return mask & ~subsumed
+
+@lru_cache(maxsize=None)
+def _tail_for(mask: int) -> tuple[tuple[str, ...], str]:
+    """
+    Return the merged conditions and combined advice for a bitmask of
+    matched symptoms.
+    
+    There are at most 2 ** len(SYMPTOM_DATABASE) masks and only a handful
+    occur in practice, so each combination is built once and reused.
+    """
+    matched = [symptom for symptom, bit in _BIT.items() if mask & bit]
+    
+    # Merge conditions from every match (the set prevents duplicates)
+    all_conditions: set[str] = set()
+    for symptom in matched:
+        all_conditions |= _COND_SET[symptom]
+    
+    return tuple(all_conditions), " ".join(_ADVICE[symptom] for symptom in matched)
+
+def analyze_symptoms(symptom_text: str, lowered: bool = False) -> dict[str, object]:
     """
     Analyze user symptoms and return matching conditions, advice, and urgency.
     
     Args:
         symptom_text (str): User's symptom description
+        lowered (bool): True if symptom_text is already lowercase
         
     Returns:
         dict: Contains conditions, advice, and urgent flag
     """
-    # Convert to lowercase for case-insensitive matching
-    symptom_text = symptom_text.lower()
-    
-    # Initialize response
-    all_conditions = set()
-    all_advice = []
-    is_urgent = False
-    
-    # Check each symptom in our database
-    for symptom, data in SYMPTOM_DATABASE.items():
-        if symptom in symptom_text:
-            # Add conditions to our set (prevents duplicates)
-            all_conditions.update(data["conditions"])
-            
-            # Add advice
-            all_advice.append(data["advice"])
-            
-            # Check if any matching symptom is urgent
-            if data["urgent"]:
-                is_urgent = True
+    # Convert to lowercase for case-insensitive matching, unless the caller
+    # already did (str.lower has its own ASCII fast path)
+    if not lowered:
+        symptom_text = symptom_text.lower()
+    
+    # Collect matching symptoms in a single pass over the input
+    mask = _match_symptoms(symptom_text)
     
     # If no symptoms matched, provide general advice
-    if not all_conditions:
+    if not mask:
         return {
             "conditions": ["General Consultation Recommended"],
             "advice": "Your symptoms don't match our database. Please consult with a healthcare provider for proper evaluation.",
             "urgent": False
         }
     
-    # Combine all advice into one comprehensive response
-    combined_advice = " ".join(all_advice)
+    # Look up the merged conditions and combined advice for this combination
+    all_conditions, combined_advice = _tail_for(mask)
+    
+    # Urgent if any matching symptom is urgent
+    is_urgent = (mask & _URGENT_MASK) != 0
     
     return {
         "conditions": list(all_conditions),
@@ -134,16 +242,64 @@ def analyze_symptoms(symptom_text):
         "urgent": is_urgent
     }
 
+# The health and symptom-list responses never change at runtime, so their
+# bodies are serialized once at import time
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "message": "Symptom Checker API is running",
+    "version": "1.0.0"
+})
+_SYMPTOMS_BODY = orjson.dumps({
+    "symptoms": list(SYMPTOM_DATABASE),
+    "count": len(SYMPTOM_DATABASE)
+})
+
+# Inputs that name exactly one symptom (e.g. "headache") make up most
+# requests, so their responses are serialized up front
+_PRECOMPUTED = {
+    symptom: orjson.dumps({
+        "conditions": list(data.conditions),
+        "advice": data.advice,
+        "urgent": data.urgent
+    })
+    for symptom, data in SYMPTOM_DATABASE.items()
+}
+
+# Validation errors are constant, so their bodies are prebuilt as well
+_INVALID_JSON_BODY = orjson.dumps({
+    "error": "Invalid JSON in request body"
+})
+_BAD_REQUEST_BODY = orjson.dumps({
+    "error": "Request body must contain a non-empty 'input' string"
+})
+
+# Only short inputs go through the cache, so it cannot pin large request
+# bodies in memory for the life of the worker
+_CACHEABLE_LEN = 256
+
+@lru_cache(maxsize=4096)
+def _analyze_bytes(text_lower: str) -> bytes:
+    """
+    Cached, JSON-serialized result of analyze_symptoms.
+    
+    analyze_symptoms is pure and SYMPTOM_DATABASE is static, so repeated
+    inputs (e.g. "headache") are served from the cache without re-analyzing
+    or re-serializing.
+    
+    Args:
+        text_lower (str): Stripped, lowercased symptom description
+        
+    Returns:
+        bytes: JSON response body
+    """
+    return orjson.dumps(analyze_symptoms(text_lower, lowered=True))
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
     Health check endpoint for monitoring and testing.
     """
-    return jsonify({
-        "status": "healthy",
-        "message": "Symptom Checker API is running",
-        "version": "1.0.0"
-    })
+    return Response(_HEALTH_BODY, mimetype="application/json")
 
 @app.route('/check-symptoms', methods=['POST'])
 def check_symptoms():
@@ -163,43 +319,46 @@ def check_symptoms():
     }
     """
     try:
-        # Get JSON data from request
-        data = request.get_json()
-        
-        # Validate input
-        if not data or 'input' not in data:
-            return jsonify({
-                "error": "Missing 'input' field in request body"
-            }), 400
-        
-        symptom_input = data['input']
+        # Parse the raw body with orjson; cache=False avoids keeping a copy
+        # of the body on the request object
+        try:
+            data = orjson.loads(request.get_data(cache=False))
+        except orjson.JSONDecodeError:
+            return Response(_INVALID_JSON_BODY, status=400, mimetype="application/json")
         
-        # Validate that input is a string
-        if not isinstance(symptom_input, str):
-            return jsonify({
-                "error": "Input must be a string"
-            }), 400
+        # Validate input: a JSON object with a non-empty, non-blank string
+        symptom_input = data.get('input') if isinstance(data, dict) else None
+        if not isinstance(symptom_input, str) or not symptom_input or symptom_input.isspace():
+            return Response(_BAD_REQUEST_BODY, status=400, mimetype="application/json")
         
-        # Validate that input is not empty
-        if not symptom_input.strip():
-            return jsonify({
-                "error": "Input cannot be empty"
-            }), 400
+        # Log the request for debugging. The level check avoids formatting
+        # the message on every request when debug logging is off.
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Symptom check request: %s", symptom_input)
         
-        # Log the request for debugging
-        logger.info(f"Symptom check request: {symptom_input}")
-        
-        # Analyze the symptoms
-        result = analyze_symptoms(symptom_input)
+        # Analyze the symptoms, normalizing first so equivalent inputs
+        # share a cache entry. Single-symptom inputs skip analysis entirely.
+        text_lower = symptom_input.strip().lower()
+        body = _PRECOMPUTED.get(text_lower)
+        if body is None:
+            if len(text_lower) <= _CACHEABLE_LEN:
+                body = _analyze_bytes(text_lower)
+            else:
+                body = orjson.dumps(analyze_symptoms(text_lower, lowered=True))
         
         # Log the result for debugging
-        logger.info(f"Analysis result: {result}")
+        if debug:
+            logger.debug("Analysis result: %s", body.decode())
         
-        return jsonify(result)
+        return Response(body, mimetype="application/json")
         
+    except RequestEntityTooLarge:
+        # Let the 413 handler answer bodies over MAX_CONTENT_LENGTH
+        raise
     except Exception as e:
         # Log the error for debugging
-        logger.error(f"Error processing symptom check: {str(e)}")
+        logger.error("Error processing symptom check: %s", e)
         
         return jsonify({
             "error": "Internal server error",
@@ -212,11 +371,9 @@ def get_available_symptoms():
     Endpoint to get list of symptoms the system can recognize.
     Useful for frontend development and testing.
     """
-    symptoms = list(SYMPTOM_DATABASE.keys())
-    return jsonify({
-        "symptoms": symptoms,
-        "count": len(symptoms)
-    })
+    response = Response(_SYMPTOMS_BODY, mimetype="application/json")
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
@@ -238,7 +395,17 @@ def method_not_allowed(error):
         "message": "This endpoint does not support the requested HTTP method"
     }), 405
 
+@app.errorhandler(413)
+def request_too_large(error):
+    """
+    Handle 413 errors with a helpful message.
+    """
+    return jsonify({
+        "error": "Request too large",
+        "message": "The request body exceeds the maximum allowed size"
+    }), 413
+
 if __name__ == '__main__':
-    # Run the Flask app in development mode
-    # In production, use a proper WSGI server like Gunicorn
-    app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
+    # Run the Flask development server (without the debugger/reloader)
+    # In production, use a proper WSGI server like Gunicorn (see run.py)
+    app.run(host='0.0.0.0', port=5000) 
\ No newline at end of file
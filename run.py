@@ -9,22 +9,50 @@ import sys
 import subprocess
 import webbrowser
 import time
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
 def check_dependencies():
     """Check if required dependencies are installed"""
+    # Only read package metadata; importing the packages here would load
+    # them twice, once for the check and again in the server process
+    for package in ("flask", "orjson", "pyahocorasick", "gunicorn", "gevent"):
+        try:
+            distribution(package)
+        except PackageNotFoundError:
+            print(f"❌ Missing dependency: {package}")
+            print("Please install dependencies with: pip install -r requirements.txt")
+            return False
+    print("✅ All dependencies are installed!")
+    return True
+
+def compile_app(script_dir):
+    """
+    Compile app.py into a C extension with mypyc (requires mypy).
+    
+    The extension is built in build/mypyc rather than next to app.py, so it
+    is only used when the server is started with --compile.
+    
+    Returns:
+        Path: Directory containing the compiled module, or None on failure
+    """
+    print("⚙️  Compiling app.py with mypyc...")
+    build_dir = script_dir / "build" / "mypyc"
+    build_dir.mkdir(parents=True, exist_ok=True)
     try:
-        import flask
-        import flask_cors
-        print("✅ All dependencies are installed!")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("Please install dependencies with: pip install -r requirements.txt")
-        return False
+        subprocess.run(
+            [sys.executable, "-m", "mypyc", str(script_dir / "app.py")],
+            cwd=build_dir,
+            check=True
+        )
+        print("✅ app.py compiled!")
+        return build_dir
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"⚠️  mypyc build failed, serving the interpreted app.py: {e}")
+        return None
 
-def start_server():
-    """Start the Flask server"""
+def start_server(compile_first=False):
+    """Start the API server under Gunicorn"""
     print("🚀 Starting Symptom Checker API...")
     print("=" * 50)
     
@@ -38,15 +66,33 @@ def start_server():
     # Change to the script directory
     os.chdir(script_dir)
     
+    # Optionally build app.py ahead of time. Gunicorn imports app:app from
+    # the build directory only for this run.
+    app_dir = script_dir
+    if compile_first:
+        app_dir = compile_app(script_dir) or script_dir
+    
+    # A compiled module next to app.py is imported instead of app.py itself
+    if app_dir == script_dir:
+        for compiled in [*script_dir.glob("app.*.so"), *script_dir.glob("app.*.pyd")]:
+            print(f"⚠️  {compiled.name} will be served instead of app.py")
+    
     # Start the Flask app
     try:
-        print("📡 Starting Flask server on http://localhost:5000")
+        print("📡 Starting Gunicorn server on http://localhost:5000")
         print("🔄 Press Ctrl+C to stop the server")
         print("=" * 50)
         
-        # Import and run the Flask app
-        from app import app
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        # Serve the app with Gunicorn: one gevent worker per CPU core
+        # instead of the single-threaded Flask development server
+        subprocess.run([
+            sys.executable, "-m", "gunicorn",
+            "-k", "gevent",
+            "-w", str(os.cpu_count() or 1),
+            "-b", "0.0.0.0:5000",
+            "--chdir", str(app_dir),
+            "app:app"
+        ], check=True)
         
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
@@ -72,8 +118,11 @@ def main():
     # Check if we should open the frontend
     open_browser = "--open" in sys.argv or "-o" in sys.argv
     
+    # Check if we should compile app.py with mypyc first
+    compile_first = "--compile" in sys.argv
+    
     # Start the server
-    if start_server():
+    if start_server(compile_first):
         if open_browser:
             # Wait a moment for the server to start
             time.sleep(2)
@@ -11,11 +11,15 @@ import time
 # API base URL
 BASE_URL = "http://localhost:5000"
 
+# Reuse one keep-alive connection across all tests
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 def test_health_check():
     """Test the health check endpoint"""
     print("🔍 Testing health check...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         if response.status_code == 200:
             print("✅ Health check passed!")
             print(f"   Response: {response.json()}")
@@ -30,7 +34,7 @@ def test_get_symptoms():
     """Test the get symptoms endpoint"""
     print("\n🔍 Testing get symptoms...")
     try:
-        response = requests.get(f"{BASE_URL}/symptoms")
+        response = SESSION.get(f"{BASE_URL}/symptoms")
         if response.status_code == 200:
             data = response.json()
             print("✅ Get symptoms passed!")
@@ -41,12 +45,12 @@ def test_get_symptoms():
     except Exception as e:
         print(f"❌ Error testing get symptoms: {e}")
 
-def test_check_symptoms(symptoms, expected_urgent=False):
+def test_check_symptoms(symptoms, expected_urgent=False, unexpected_conditions=(), unexpected_advice=None):
     """Test the check symptoms endpoint"""
     print(f"\n🔍 Testing check symptoms: '{symptoms}'")
     try:
         data = {"input": symptoms}
-        response = requests.post(f"{BASE_URL}/check-symptoms", json=data)
+        response = SESSION.post(f"{BASE_URL}/check-symptoms", json=data)
         
         if response.status_code == 200:
             result = response.json()
@@ -59,6 +63,18 @@ def test_check_symptoms(symptoms, expected_urgent=False):
                 print("✅ Urgency level matches expectation!")
             else:
                 print(f"⚠️  Urgency level unexpected. Expected: {expected_urgent}, Got: {result['urgent']}")
+            
+            present = [c for c in unexpected_conditions if c in result['conditions']]
+            if present:
+                print(f"❌ Unexpected conditions returned: {present}")
+            elif unexpected_conditions:
+                print("✅ Unexpected conditions are absent!")
+            
+            if unexpected_advice is not None:
+                if unexpected_advice in result['advice']:
+                    print(f"❌ Unexpected advice returned: {unexpected_advice[:60]}...")
+                else:
+                    print("✅ Unexpected advice is absent!")
         else:
             print(f"❌ Check symptoms failed with status {response.status_code}")
             print(f"   Response: {response.text}")
@@ -71,7 +87,7 @@ def test_error_handling():
     
     # Test missing input
     try:
-        response = requests.post(f"{BASE_URL}/check-symptoms", json={})
+        response = SESSION.post(f"{BASE_URL}/check-symptoms", json={})
         if response.status_code == 400:
             print("✅ Missing input error handled correctly!")
         else:
@@ -81,13 +97,37 @@ def test_error_handling():
     
     # Test empty input
     try:
-        response = requests.post(f"{BASE_URL}/check-symptoms", json={"input": ""})
+        response = SESSION.post(f"{BASE_URL}/check-symptoms", json={"input": ""})
         if response.status_code == 400:
             print("✅ Empty input error handled correctly!")
         else:
             print(f"❌ Expected 400, got {response.status_code}")
     except Exception as e:
         print(f"❌ Error testing empty input: {e}")
+    
+    # Test malformed JSON body
+    try:
+        response = SESSION.post(
+            f"{BASE_URL}/check-symptoms",
+            data="not json",
+            headers={"Content-Type": "application/json"}
+        )
+        if response.status_code == 400:
+            print("✅ Invalid JSON error handled correctly!")
+        else:
+            print(f"❌ Expected 400, got {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error testing invalid JSON: {e}")
+    
+    # Test JSON body that is not an object
+    try:
+        response = SESSION.post(f"{BASE_URL}/check-symptoms", json=["input"])
+        if response.status_code == 400:
+            print("✅ Non-object JSON error handled correctly!")
+        else:
+            print(f"❌ Expected 400, got {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error testing non-object JSON: {e}")
 
 def main():
     """Run all tests"""
@@ -109,6 +149,14 @@ def main():
     test_check_symptoms("I have severe abdominal pain", expected_urgent=True)
     test_check_symptoms("I have dizziness and nausea", expected_urgent=False)
     
+    # Test that "high fever" subsumes a separately mentioned "fever"
+    test_check_symptoms(
+        "I had a fever, now a high fever",
+        expected_urgent=True,
+        unexpected_conditions=["Common Cold", "Flu"],
+        unexpected_advice="Take acetaminophen or ibuprofen for fever."
+    )
+    
     # Test unknown symptoms
     test_check_symptoms("I have purple spots on my elbow", expected_urgent=False)
     